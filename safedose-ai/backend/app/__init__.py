@@ -24,3 +24,7 @@ app.add_middleware(
 # Import and include routers
 from app.api.endpoints import router as api_router
 app.include_router(api_router, prefix="/api/v1")
+
+# Opt-in per-request profiling (no middleware unless configured)
+from app.utils.profiling import install_profiling
+install_profiling(app)
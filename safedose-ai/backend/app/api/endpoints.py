@@ -2,16 +2,27 @@
 API endpoints for SafeDose.ai
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Path
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 from datetime import datetime
 from pydantic import BaseModel
+from app.models.ai_models import RiskHeatmapResult
+from app.services.misinformation_detector import MisinformationDetector
+from app.services.analysis_store import analysis_store
+from app.utils.helpers import content_hash
+from app.utils import profiling
 
 # Simple request/response models for now
 class TextAnalysisRequest(BaseModel):
     text: str
     source_url: str = ""
 
+class HeatmapRequest(BaseModel):
+    text: str
+    window_size: int = 50
+    stride: int = 25
+
 class TextAnalysisResponse(BaseModel):
     analysis_id: int
     misinformation_score: float
@@ -20,6 +31,7 @@ class TextAnalysisResponse(BaseModel):
     analysis_result: str
     recommendations: List[str]
     created_at: datetime
+    content_hash: str = ""
 
 class MisinformationDetectionResult(BaseModel):
     score: float
@@ -37,95 +49,135 @@ class TrustedMessengerResult(BaseModel):
     fact_check_links: List[str]
 
 router = APIRouter()
+misinformation_detector = MisinformationDetector()
 
 @router.post("/analyze", response_model=TextAnalysisResponse)
 async def analyze_text(request: TextAnalysisRequest):
     """
     Analyze text for misinformation, persuasion techniques, and provide trusted alternatives.
     """
-    try:
-        # Simple mock analysis for now
-        text_length = len(request.text)
-        word_count = len(request.text.split())
-        
-        # Mock scores based on text characteristics
-        misinformation_score = min(0.3 + (text_length % 100) / 1000, 0.9)
-        persuasion_score = min(0.2 + (word_count % 50) / 500, 0.8)
-        trust_score = max(0.1, 1 - (misinformation_score + persuasion_score) / 2)
-        
-        # Generate recommendations
-        recommendations = []
-        if misinformation_score > 0.7:
-            recommendations.append("High misinformation risk detected. Verify facts from multiple sources.")
-        if persuasion_score > 0.8:
-            recommendations.append("Strong persuasion techniques detected. Consider the intent behind this message.")
-        if trust_score < 0.5:
-            recommendations.append("Low trust score. Seek information from verified sources.")
-        
-        if not recommendations:
-            recommendations.append("Text appears to be relatively trustworthy. Always verify important information.")
-        
-        return TextAnalysisResponse(
-            analysis_id=1,
-            misinformation_score=misinformation_score,
-            persuasion_score=persuasion_score,
-            trust_score=trust_score,
-            analysis_result=f"Analysis complete. Misinformation risk: {misinformation_score:.2f}, Persuasion techniques: {persuasion_score:.2f}",
-            recommendations=recommendations,
-            created_at=datetime.utcnow()
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    with profiling.stage("endpoints.analyze"):
+        try:
+            with profiling.stage("endpoints.analyze.content_hash"):
+                text_hash = content_hash(request.text)
+            
+            # Simple mock analysis for now
+            text_length = len(request.text)
+            word_count = len(request.text.split())
+            
+            # Mock scores based on text characteristics
+            misinformation_score = min(0.3 + (text_length % 100) / 1000, 0.9)
+            persuasion_score = min(0.2 + (word_count % 50) / 500, 0.8)
+            trust_score = max(0.1, 1 - (misinformation_score + persuasion_score) / 2)
+            
+            # Generate recommendations
+            recommendations = []
+            if misinformation_score > 0.7:
+                recommendations.append("High misinformation risk detected. Verify facts from multiple sources.")
+            if persuasion_score > 0.8:
+                recommendations.append("Strong persuasion techniques detected. Consider the intent behind this message.")
+            if trust_score < 0.5:
+                recommendations.append("Low trust score. Seek information from verified sources.")
+            
+            if not recommendations:
+                recommendations.append("Text appears to be relatively trustworthy. Always verify important information.")
+            
+            response = TextAnalysisResponse(
+                analysis_id=1,
+                misinformation_score=misinformation_score,
+                persuasion_score=persuasion_score,
+                trust_score=trust_score,
+                analysis_result=f"Analysis complete. Misinformation risk: {misinformation_score:.2f}, Persuasion techniques: {persuasion_score:.2f}",
+                recommendations=recommendations,
+                created_at=datetime.utcnow(),
+                content_hash=text_hash
+            )
+            
+            # Keep the result so clients can fetch it by hash instead of re-uploading the text;
+            # a text this worker already stored skips the database (and the threadpool)
+            if not analysis_store.cached(response.content_hash, request.source_url):
+                await run_in_threadpool(analysis_store.put, response.content_hash, request.source_url, response)
+            return response
+            
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@router.get("/analyze/{text_hash}", response_model=TextAnalysisResponse)
+def lookup_analysis(text_hash: str = Path(..., pattern="^[0-9a-f]{64}$"), source_url: str = ""):
+    """
+    Return a stored analysis by content hash, or 404 so the client uploads the full text.
+    """
+    result = analysis_store.get(text_hash, source_url)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No stored analysis for this content hash")
+    return result
 
 @router.post("/detect-misinformation", response_model=MisinformationDetectionResult)
 async def detect_misinformation(request: TextAnalysisRequest):
     """
     Detect misinformation in text.
     """
+    with profiling.stage("endpoints.detect_misinformation"):
+        try:
+            # Mock misinformation detection
+            score = min(0.3 + (len(request.text) % 100) / 1000, 0.9)
+            return MisinformationDetectionResult(
+                score=score,
+                confidence=0.7,
+                explanation="Mock analysis based on text characteristics"
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Misinformation detection failed: {str(e)}")
+
+@router.post("/risk-heatmap", response_model=RiskHeatmapResult)
+def risk_heatmap(request: HeatmapRequest):
+    """
+    Score sliding windows of a long text for misinformation and persuasion density.
+    
+    A plain def, so FastAPI runs the CPU-bound scoring in its threadpool
+    instead of on the event loop.
+    """
     try:
-        # Mock misinformation detection
-        score = min(0.3 + (len(request.text) % 100) / 1000, 0.9)
-        return MisinformationDetectionResult(
-            score=score,
-            confidence=0.7,
-            explanation="Mock analysis based on text characteristics"
-        )
+        return misinformation_detector.heatmap(request.text, request.window_size, request.stride)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Misinformation detection failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Risk heatmap failed: {str(e)}")
 
 @router.post("/analyze-persuasion", response_model=PersuasionAnalysisResult)
 async def analyze_persuasion(request: TextAnalysisRequest):
     """
     Analyze persuasion techniques in text.
     """
-    try:
-        # Mock persuasion analysis
-        score = min(0.2 + (len(request.text.split()) % 50) / 500, 0.8)
-        techniques = ["emotional appeal", "authority"] if score > 0.5 else ["neutral"]
-        return PersuasionAnalysisResult(
-            score=score,
-            techniques=techniques,
-            explanation="Mock analysis of persuasion techniques"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Persuasion analysis failed: {str(e)}")
+    with profiling.stage("endpoints.analyze_persuasion"):
+        try:
+            # Mock persuasion analysis
+            score = min(0.2 + (len(request.text.split()) % 50) / 500, 0.8)
+            techniques = ["emotional appeal", "authority"] if score > 0.5 else ["neutral"]
+            return PersuasionAnalysisResult(
+                score=score,
+                techniques=techniques,
+                explanation="Mock analysis of persuasion techniques"
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Persuasion analysis failed: {str(e)}")
 
 @router.post("/get-trusted-alternatives", response_model=TrustedMessengerResult)
 async def get_trusted_alternatives(request: TextAnalysisRequest):
     """
     Get trusted alternatives and fact-checking resources.
     """
-    try:
-        # Mock trusted alternatives
-        trust_score = max(0.1, 1 - (len(request.text) % 100) / 1000)
-        return TrustedMessengerResult(
-            trust_score=trust_score,
-            alternatives=["https://www.reuters.com", "https://www.ap.org", "https://www.factcheck.org"],
-            fact_check_links=["https://www.snopes.com", "https://www.politifact.com"]
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Trusted alternatives lookup failed: {str(e)}")
+    with profiling.stage("endpoints.get_trusted_alternatives"):
+        try:
+            # Mock trusted alternatives
+            trust_score = max(0.1, 1 - (len(request.text) % 100) / 1000)
+            return TrustedMessengerResult(
+                trust_score=trust_score,
+                alternatives=["https://www.reuters.com", "https://www.ap.org", "https://www.factcheck.org"],
+                fact_check_links=["https://www.snopes.com", "https://www.politifact.com"]
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Trusted alternatives lookup failed: {str(e)}")
 
 @router.get("/health")
 async def health_check():
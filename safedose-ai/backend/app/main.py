@@ -1,15 +1,127 @@
 """
 Main entry point for the SafeDose.ai FastAPI application.
+
+    python -m app.main                 # single-process development server with reload
+    python -m app.main --production    # pre-forked gunicorn workers sharing preloaded state
+
+In production mode the parent process imports the app, loads the fact-check
+corpus and warms the detection patterns once, then forks the workers so they
+share that memory copy-on-write. Send SIGTERM to drain and stop, SIGHUP to
+gracefully replace all workers, and SIGTTIN/SIGTTOU to add or remove one.
 """
 
+import os
+import gc
+import sys
+import asyncio
+import argparse
 import uvicorn
 from app import app
 
+def get_worker_count() -> int:
+    """
+    Number of production workers: WEB_CONCURRENCY/API_WORKERS if set, else one per usable CPU.
+    """
+    configured = os.getenv("WEB_CONCURRENCY") or os.getenv("API_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    # Respect CPU affinity (taskset, container cpusets) where the platform reports it
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+def preload() -> None:
+    """
+    Build shared state in the parent so forked workers inherit it instead of rebuilding it.
+
+    Importing app has already built the endpoint singletons, including the
+    detector's compiled heatmap patterns; this loads what they build lazily.
+    """
+    from app.api.endpoints import misinformation_detector
+    from app.services import PersuasionEngine
+    from app.services.fact_check_index import load_fact_check_index
+
+    # The fact-check corpus is cached per process, so every TrustedMessenger reuses it
+    load_fact_check_index()
+
+    # detect() and analyze() pass pattern strings to the re module, whose compile cache is
+    # process-wide; one pass over a sample fills it for every instance
+    sample = "Experts say this shocking study is proven because if it works then everyone should join now."
+    asyncio.run(misinformation_detector.detect(sample))
+    asyncio.run(PersuasionEngine().analyze(sample))
+
+def post_fork(server, worker) -> None:
+    """
+    Per-worker setup after gunicorn forks it from the preloaded parent.
+    """
+    from app.models.database import engine
+
+    # Connections opened by the parent must not be shared with the child
+    engine.dispose(close=False)
+
+def run_production(host: str, port: int) -> None:
+    """
+    Serve the app with gunicorn-managed uvicorn workers forked from a preloaded parent.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": get_worker_count(),
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+                "timeout": int(os.getenv("WORKER_TIMEOUT", "60")),
+                "keepalive": 5,
+                # Recycle workers periodically so per-worker RSS does not creep up
+                "max_requests": int(os.getenv("MAX_REQUESTS", "10000")),
+                "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+                "loglevel": "info",
+                "post_fork": post_fork,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.models.database import init_db
+
+            # Create the tables once here rather than racing to create them in every worker
+            init_db()
+            preload()
+            # Move preloaded objects out of the collector's reach so collections in the
+            # workers do not touch (and copy) the shared pages. Collection is paused only
+            # between the collect and the freeze; the master keeps collecting afterwards
+            # and the forked workers inherit that.
+            gc.disable()
+            gc.collect()
+            gc.freeze()
+            gc.enable()
+            return app
+
+    ProductionServer().run()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run the SafeDose.ai API")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("APP_ENV", "").lower() == "production",
+                        help="Run pre-forked production workers instead of the reload server")
+    args = parser.parse_args(argv)
+
+    host = os.getenv("API_HOST", "0.0.0.0")
+    port = int(os.getenv("API_PORT", "8001"))
+
+    if args.production:
+        run_production(host, port)
+    else:
+        uvicorn.run(
+            "app:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level="info"
+        )
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=8001,
-        reload=True,
-        log_level="info"
-    )
+    main(sys.argv[1:])
@@ -26,6 +26,14 @@ class MisinformationDetectionResult(BaseModel):
     detected_patterns: List[str]
     explanation: str
 
+class RiskHeatmapResult(BaseModel):
+    window_size: int
+    stride: int
+    total_words: int
+    window_starts: List[int]
+    misinformation_scores: List[float]
+    persuasion_scores: List[float]
+
 class PersuasionAnalysisResult(BaseModel):
     score: float
     techniques_detected: List[str]
@@ -2,11 +2,22 @@
 Database models for SafeDose.ai
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
+import os
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
 
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./safedose.db")
+
+# Connections are opened lazily; forked server workers must call engine.dispose(close=False)
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+)
+SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
 Base = declarative_base()
 
 class User(Base):
@@ -29,6 +40,7 @@ class Analysis(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     text_content = Column(Text)
     source_url = Column(String(500), nullable=True)
+    content_hash = Column(String(64), index=True, nullable=True)
     misinformation_score = Column(Float)
     persuasion_score = Column(Float)
     trust_score = Column(Float)
@@ -48,3 +60,9 @@ class TrustedSource(Base):
     trust_score = Column(Float, default=1.0)
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+def init_db(bind=None) -> None:
+    """
+    Create any missing tables.
+    """
+    Base.metadata.create_all(bind=bind or engine)
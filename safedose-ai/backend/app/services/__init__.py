@@ -5,3 +5,5 @@ AI services for SafeDose.ai
 from .misinformation_detector import MisinformationDetector
 from .persuasion_engine import PersuasionEngine
 from .trusted_messenger import TrustedMessenger
+from .fact_check_index import FactCheckIndex
+from .analysis_store import AnalysisStore
@@ -0,0 +1,124 @@
+"""
+Stored analysis results for SafeDose.ai, keyed by content hash
+
+Lets clients look up a previous /analyze result by content hash before
+uploading the full text. Results are saved to the Analysis table, indexed by
+content_hash, so every server worker (and every server sharing DATABASE_URL)
+sees them; a bounded in-process LRU in front of it answers repeat lookups
+without a query. If the database is unavailable, lookups fall back to the LRU.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.database import Analysis, SessionLocal, init_db
+
+logger = logging.getLogger(__name__)
+
+class AnalysisStore:
+    def __init__(self, max_entries: int = 10000, session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self._results: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tables_ready = False
+
+    def get(self, content_hash: str, source_url: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Return the stored result for the hash and source URL, or None.
+        """
+        key = (content_hash, source_url or "")
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        try:
+            with self._session() as session:
+                result = self._load(session, key)
+        except SQLAlchemyError as e:
+            logger.warning("Analysis lookup failed: %s", e)
+            return None
+        if result is None:
+            return None
+
+        self._remember(key, result)
+        return result
+
+    def cached(self, content_hash: str, source_url: str = "") -> bool:
+        """
+        Whether the hash and source URL are in the in-process LRU, without a query.
+        """
+        with self._lock:
+            return (content_hash, source_url or "") in self._results
+
+    def put(self, content_hash: str, source_url: str, result: Any) -> None:
+        """
+        Save a result (a pydantic model or a JSON-serializable dict).
+
+        A key that is already stored keeps its first result, so repeat
+        analyses of the same text do not write to the database again.
+        """
+        key = (content_hash, source_url or "")
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return
+        if hasattr(result, "model_dump"):
+            result = result.model_dump(mode="json")
+
+        # The whole response goes in analysis_result so a lookup can return it unchanged
+        try:
+            with self._session() as session:
+                stored = self._load(session, key)
+                if stored is not None:
+                    result = stored
+                else:
+                    session.add(Analysis(
+                        content_hash=content_hash,
+                        source_url=key[1],
+                        misinformation_score=result.get("misinformation_score"),
+                        persuasion_score=result.get("persuasion_score"),
+                        trust_score=result.get("trust_score"),
+                        analysis_result=json.dumps(result)
+                    ))
+                    session.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Could not save analysis %s: %s", content_hash, e)
+        self._remember(key, result)
+
+    def _load(self, session, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Return the first stored result for the key, or None.
+        """
+        row = (session.query(Analysis.analysis_result)
+               .filter(Analysis.content_hash == key[0], Analysis.source_url == key[1])
+               .order_by(Analysis.id)
+               .first())
+        return json.loads(row.analysis_result) if row is not None else None
+
+    def _remember(self, key: Tuple[str, str], result: Dict[str, Any]) -> None:
+        """
+        Add a result to the LRU, evicting the least recently used one when full.
+        """
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def _session(self):
+        if not self._tables_ready:
+            init_db(self.session_factory.kw.get("bind"))
+            self._tables_ready = True
+        return self.session_factory()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+analysis_store = AnalysisStore(int(os.getenv("ANALYSIS_STORE_SIZE", "10000")))
@@ -0,0 +1,347 @@
+"""
+Local fact-check article corpus for SafeDose.ai
+
+Articles are kept in an in-memory inverted index. Each posting list stores
+document-id gaps and term frequencies as varint-encoded bytes, which keeps a
+corpus of a million articles compact, and is split into blocks of BLOCK_SIZE
+postings with the highest BM25 contribution recorded per block. Queries are
+ranked with BM25 using block-max MaxScore: terms are visited from the most to
+the least selective, and once the top-k threshold rises, blocks that cannot
+lift a new document into it are only decoded where they hold documents still
+in contention. Posting bytes are read in place through numpy views.
+"""
+
+import os
+import json
+import logging
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from app.utils.helpers import tokenize
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 128
+MAX_LOGGED_BAD_RECORDS = 10
+
+def _append_varint(buf: bytearray, value: int) -> None:
+    """
+    Append a non-negative integer to buf using 7 bits per byte.
+    """
+    while value >= 0x80:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+def _varint_starts(data: np.ndarray) -> np.ndarray:
+    """
+    Byte offset at which each varint in data begins.
+    """
+    is_last = data < 0x80
+    if is_last.all():
+        return np.arange(len(data))
+    return np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+
+def _decode_varints(buf) -> np.ndarray:
+    """
+    Decode a run of varints (any bytes-like object, read without copying) into an int64 array.
+    """
+    data = np.frombuffer(buf, dtype=np.uint8)
+    is_last = data < 0x80
+    if is_last.all():
+        return data.astype(np.int64)
+
+    # Byte position inside its own varint gives the shift for its 7 payload bits
+    is_start = np.concatenate(([True], is_last[:-1]))
+    starts = np.flatnonzero(is_start)
+    shift = (np.arange(len(data)) - starts[np.cumsum(is_start) - 1]) * 7
+    payload = (data & 0x7f).astype(np.int64) << shift
+    return np.add.reduceat(payload, starts)
+
+def _ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Concatenation of arange(start, end) for each pair, built without a Python loop.
+    """
+    lengths = ends - starts
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+
+class _TermBlocks:
+    """
+    Block metadata for one term's posting list, valid for one index generation.
+    """
+
+    def __init__(self, idf: float, df: int, block_last: np.ndarray, block_max: np.ndarray,
+                 doc_offsets: np.ndarray, tf_offsets: np.ndarray):
+        self.idf = idf
+        self.df = df
+        self.block_last = block_last      # last doc id in each block
+        self.block_max = block_max        # highest BM25 contribution in each block
+        self.doc_offsets = doc_offsets    # byte offsets of each block in the gap buffer (+ end)
+        self.tf_offsets = tf_offsets      # byte offsets of each block in the tf buffer (+ end)
+        self.upper = float(block_max.max())
+
+class FactCheckIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        # BM25 parameters
+        self.k1 = k1
+        self.b = b
+
+        # Article metadata, addressed by document id
+        self.urls: List[str] = []
+        self.titles: List[str] = []
+        self.doc_lengths = array('I')
+
+        # Compressed postings: doc-id gaps and term frequencies per term
+        self._doc_gaps: Dict[str, bytearray] = {}
+        self._term_freqs: Dict[str, bytearray] = {}
+        self._last_doc: Dict[str, int] = {}
+        self._doc_freq: Dict[str, int] = {}
+        self._total_length = 0
+
+        # Block metadata, built lazily per term and dropped whenever a document is added
+        # (idf and the average length change with every document)
+        self._blocks: Dict[str, _TermBlocks] = {}
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def add(self, url: str, title: str, text: str = "") -> int:
+        """
+        Index a fact-check article and return its document id.
+        """
+        doc_id = len(self.urls)
+        terms = tokenize(f"{title} {text}")
+
+        self.urls.append(url)
+        self.titles.append(title)
+        self.doc_lengths.append(len(terms))
+        self._total_length += len(terms)
+        if self._blocks:
+            self._blocks.clear()
+
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+
+        for term, count in counts.items():
+            if term not in self._doc_gaps:
+                self._doc_gaps[term] = bytearray()
+                self._term_freqs[term] = bytearray()
+                self._last_doc[term] = 0
+                self._doc_freq[term] = 0
+            _append_varint(self._doc_gaps[term], doc_id - self._last_doc[term])
+            _append_varint(self._term_freqs[term], count)
+            self._last_doc[term] = doc_id
+            self._doc_freq[term] += 1
+
+        return doc_id
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "FactCheckIndex":
+        """
+        Build an index from a JSONL file with one article per line.
+
+        Each record needs a "url" and "title"; "claim" and "text" are indexed
+        when present. Lines that are not valid JSON or have no "url" are
+        skipped and logged, so one bad record does not discard the corpus.
+        """
+        index = cls()
+        skipped = 0
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    article = json.loads(line)
+                    url = article['url']
+                except (ValueError, TypeError, KeyError) as e:
+                    skipped += 1
+                    if skipped <= MAX_LOGGED_BAD_RECORDS:
+                        logger.warning("Skipping fact-check record %s:%d: %r", path, line_number, e)
+                    continue
+                body = f"{article.get('claim', '')} {article.get('text', '')}"
+                index.add(url, article.get('title', ''), body)
+        if skipped:
+            logger.warning("Skipped %d malformed fact-check records in %s", skipped, path)
+        return index
+
+    def prepare(self) -> None:
+        """
+        Build block metadata for every posting list longer than one block.
+
+        Otherwise the first query for a common term pays for decoding its whole
+        posting list; short lists stay lazy since they are cheap to decode.
+        """
+        for term, df in self._doc_freq.items():
+            if df > BLOCK_SIZE:
+                self._term_blocks(term)
+
+    def search(self, query_terms: List[str], k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Return the top-k articles for the query terms, ranked by BM25.
+        """
+        num_docs = len(self.urls)
+        terms = {t for q in query_terms for t in tokenize(q) if t in self._doc_gaps}
+        if num_docs == 0 or k <= 0 or not terms:
+            return []
+
+        # Most selective terms first, so the top-k threshold rises before the long lists
+        blocks = {term: self._term_blocks(term) for term in terms}
+        order = sorted(terms, key=lambda term: (-blocks[term].upper, term))
+        remaining_upper = np.cumsum([blocks[term].upper for term in order][::-1])[::-1]
+
+        docs = np.empty(0, dtype=np.int64)
+        scores = np.empty(0, dtype=np.float64)
+        # Each block maximum is one document's score for that term, and a term's blocks hold
+        # distinct documents, so the k-th best block maximum of any term is a safe starting threshold.
+        # A document scoring exactly the threshold can still be in the top k, so pruning keeps ties.
+        threshold = max((float(np.partition(info.block_max, len(info.block_max) - k)[len(info.block_max) - k])
+                         for info in blocks.values() if len(info.block_max) >= k), default=0.0)
+
+        for i, term in enumerate(order):
+            info = blocks[term]
+            later_upper = remaining_upper[i] - info.upper
+
+            # Drop candidates that cannot reach the threshold even with this term's block maximum
+            # and the upper bounds of the terms after it
+            block_of_doc = np.searchsorted(info.block_last, docs)
+            if len(docs):
+                keep = scores + self._block_max_at(info, block_of_doc) + later_upper >= threshold
+                docs, scores, block_of_doc = docs[keep], scores[keep], block_of_doc[keep]
+
+            # Documents not seen yet can only enter through blocks whose maximum reaches the
+            # threshold; other blocks are decoded only where they hold surviving candidates
+            open_blocks = info.block_max + later_upper >= threshold
+            probed = block_of_doc[block_of_doc < len(open_blocks)]
+            needed = open_blocks.copy()
+            needed[probed] = True
+            block_ids = np.flatnonzero(needed)
+            if len(block_ids) == 0:
+                continue
+
+            term_docs, term_tf = self._decode_blocks(term, info, block_ids)
+            term_scores = self._bm25(info.idf, term_tf.astype(np.float64), term_docs)
+            counts = np.minimum(BLOCK_SIZE, info.df - block_ids * BLOCK_SIZE)
+            from_open = np.repeat(open_blocks[block_ids], counts)
+
+            # Postings for existing candidates always count; other postings admit a new
+            # document only from an open block and with enough score to matter
+            admit = from_open & (term_scores + later_upper >= threshold)
+            if len(docs) == 0:
+                docs, scores = term_docs[admit], term_scores[admit]
+            else:
+                docs, scores = self._merge(docs, scores, term_docs, term_scores, admit)
+
+            # Partial scores only grow, so the current k-th best is a safe lower bound
+            if len(scores) >= k:
+                threshold = max(threshold, float(np.partition(scores, len(scores) - k)[len(scores) - k]))
+
+        top = np.argsort(-scores, kind='stable')[:k]
+        return [
+            {'url': self.urls[docs[i]], 'title': self.titles[docs[i]], 'score': float(scores[i])}
+            for i in top
+        ]
+
+    def _merge(self, docs: np.ndarray, scores: np.ndarray, term_docs: np.ndarray,
+               term_scores: np.ndarray, admit: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Add a term's postings to the sorted candidates, admitting new documents only where allowed.
+        """
+        # Both inputs are sorted, so a stable sort of the two runs is a linear merge
+        merged = np.concatenate((docs, term_docs))
+        by_doc = np.argsort(merged, kind='stable')
+        merged = merged[by_doc]
+        is_start = np.concatenate(([True], merged[1:] != merged[:-1]))
+        starts = np.flatnonzero(is_start)
+        keep_entry = np.concatenate((np.ones(len(docs), dtype=bool), admit))[by_doc]
+        keep = np.logical_or.reduceat(keep_entry, starts)
+        merged_scores = np.add.reduceat(np.concatenate((scores, term_scores))[by_doc], starts)
+        return merged[starts][keep], merged_scores[keep]
+
+    def _block_max_at(self, info: _TermBlocks, block_ids: np.ndarray) -> np.ndarray:
+        """
+        Block maximum for each block id, or 0 past the end of the posting list.
+        """
+        inside = block_ids < len(info.block_max)
+        return np.where(inside, info.block_max[np.minimum(block_ids, len(info.block_max) - 1)], 0.0)
+
+    def _bm25(self, idf: float, tf: np.ndarray, docs: np.ndarray) -> np.ndarray:
+        """
+        BM25 contribution of one term for the given documents and term frequencies.
+        """
+        doc_lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)[docs]
+        avg_length = self._total_length / len(self.urls)
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths / avg_length)
+        return idf * tf * (self.k1 + 1) / (tf + norm)
+
+    def _term_blocks(self, term: str) -> _TermBlocks:
+        """
+        Split a term's posting list into blocks and record each block's maximum score.
+        """
+        if term in self._blocks:
+            return self._blocks[term]
+
+        gap_data = np.frombuffer(self._doc_gaps[term], dtype=np.uint8)
+        tf_data = np.frombuffer(self._term_freqs[term], dtype=np.uint8)
+        docs = np.cumsum(_decode_varints(gap_data))
+        tf = _decode_varints(tf_data).astype(np.float64)
+
+        df = len(docs)
+        num_docs = len(self.urls)
+        idf = float(np.log(1 + (num_docs - df + 0.5) / (df + 0.5)))
+
+        # Postings are delta-encoded across the whole list, so a block decodes from the
+        # previous block's last doc id without re-encoding anything
+        first = np.arange(0, df, BLOCK_SIZE)
+        info = _TermBlocks(
+            idf=idf,
+            df=df,
+            block_last=docs[np.append(first[1:], df) - 1],
+            block_max=np.maximum.reduceat(self._bm25(idf, tf, docs), first),
+            doc_offsets=np.append(_varint_starts(gap_data)[first], len(gap_data)),
+            tf_offsets=np.append(_varint_starts(tf_data)[first], len(tf_data))
+        )
+        self._blocks[term] = info
+        return info
+
+    def _decode_blocks(self, term: str, info: _TermBlocks, block_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decode the doc ids and term frequencies of the given (ascending) blocks.
+        """
+        gap_data = np.frombuffer(self._doc_gaps[term], dtype=np.uint8)
+        tf_data = np.frombuffer(self._term_freqs[term], dtype=np.uint8)
+        if len(block_ids) == len(info.block_last):
+            return np.cumsum(_decode_varints(gap_data)), _decode_varints(tf_data)
+
+        gaps = _decode_varints(gap_data[_ranges(info.doc_offsets[block_ids], info.doc_offsets[block_ids + 1])])
+        tf = _decode_varints(tf_data[_ranges(info.tf_offsets[block_ids], info.tf_offsets[block_ids + 1])])
+
+        # Re-base each block's running sum on the last doc id of the block before it
+        counts = np.minimum(BLOCK_SIZE, info.df - block_ids * BLOCK_SIZE)
+        block_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        base = np.where(block_ids > 0, info.block_last[block_ids - 1], 0)
+        running = np.cumsum(gaps)
+        docs = running + np.repeat(base - (running[block_start] - gaps[block_start]), counts)
+        return docs, tf
+
+@lru_cache(maxsize=None)
+def load_fact_check_index(path: Optional[str] = None) -> Optional[FactCheckIndex]:
+    """
+    Load the fact-check corpus configured by FACT_CHECK_CORPUS_PATH, once per process.
+
+    A corpus file that cannot be opened is logged and treated as no corpus, so
+    callers fall back to the fact-checking homepages instead of failing.
+    """
+    path = path or os.getenv('FACT_CHECK_CORPUS_PATH')
+    if not path:
+        return None
+    try:
+        index = FactCheckIndex.from_jsonl(path)
+    except OSError as e:
+        logger.error("Could not load fact-check corpus %s: %s", path, e)
+        return None
+    index.prepare()
+    return index
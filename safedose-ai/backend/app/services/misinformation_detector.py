@@ -3,8 +3,11 @@ Misinformation detection service for SafeDose.ai
 """
 
 import re
-from typing import List
-from app.models.ai_models import MisinformationDetectionResult
+from typing import List, Pattern
+import numpy as np
+from app.models.ai_models import MisinformationDetectionResult, RiskHeatmapResult
+from app.services.persuasion_engine import PersuasionEngine
+from app.utils import profiling
 
 class MisinformationDetector:
     def __init__(self):
@@ -25,6 +28,14 @@ class MisinformationDetector:
             'evidence', 'data', 'statistics', 'source'
         ]
         
+        # Compiled once for the heatmap, which needs match positions rather than counts
+        self._misinformation_regexes = [re.compile(p, re.IGNORECASE) for p in self.misinformation_patterns]
+        self._fact_check_regexes = [re.compile(re.escape(k), re.IGNORECASE) for k in self.fact_check_keywords]
+        self._persuasion_regexes = [re.compile(p, re.IGNORECASE)
+                                    for patterns in PersuasionEngine().persuasion_techniques.values()
+                                    for p in patterns]
+        
+    @profiling.profiled("misinformation_detector.detect")
     async def detect(self, text: str) -> MisinformationDetectionResult:
         """
         Detect misinformation in the given text.
@@ -36,7 +47,7 @@ class MisinformationDetector:
         detected_patterns = []
         
         for pattern in self.misinformation_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
+            matches = profiling.findall(pattern, text_lower, re.IGNORECASE)
             if matches:
                 pattern_matches += len(matches)
                 detected_patterns.extend(matches)
@@ -69,6 +80,80 @@ class MisinformationDetector:
             explanation=explanation
         )
     
+    def heatmap(self, text: str, window_size: int = 50, stride: int = 25) -> RiskHeatmapResult:
+        """
+        Score sliding windows of the text for misinformation and persuasion density.
+        
+        Every pattern is matched once over the whole text; matches are bucketed by
+        token position and turned into prefix sums, so each window is scored in O(1)
+        regardless of window size or stride. A window scores as detect() and
+        PersuasionEngine.analyze() score its text, except that a match spanning
+        several words counts in the window holding its first word.
+        
+        Synchronous and CPU-bound, so async callers should run it in a worker thread.
+        """
+        with profiling.stage("misinformation_detector.heatmap"):
+            return self._heatmap(text, window_size, stride)
+    
+    def _heatmap(self, text: str, window_size: int, stride: int) -> RiskHeatmapResult:
+        if window_size < 1 or stride < 1:
+            raise ValueError("window_size and stride must be positive")
+        
+        token_starts = np.array([m.start() for m in re.finditer(r'\S+', text)], dtype=np.int64)
+        total_words = len(token_starts)
+        if total_words == 0:
+            return RiskHeatmapResult(window_size=window_size, stride=stride, total_words=0,
+                                     window_starts=[], misinformation_scores=[], persuasion_scores=[])
+        
+        misinformation_sums = self._token_prefix_sums(text, token_starts, self._misinformation_regexes)
+        persuasion_sums = self._token_prefix_sums(text, token_starts, self._persuasion_regexes)
+        # One row per keyword: detect() counts the distinct keywords present, not occurrences
+        keyword_sums = np.stack([self._token_prefix_sums(text, token_starts, [regex])
+                                 for regex in self._fact_check_regexes])
+        
+        # Window start offsets, with a final window flush against the end of the text
+        window_size = min(window_size, total_words)
+        last_start = total_words - window_size
+        starts = np.arange(0, last_start + 1, stride, dtype=np.int64)
+        if starts[-1] != last_start:
+            starts = np.append(starts, last_start)
+        ends = starts + window_size
+        
+        # Same formulas as detect() and PersuasionEngine.analyze(), applied per window
+        pattern_density = (misinformation_sums[ends] - misinformation_sums[starts]) / window_size
+        fact_check_count = ((keyword_sums[:, ends] - keyword_sums[:, starts]) > 0).sum(axis=0)
+        fact_check_ratio = fact_check_count / window_size
+        misinformation_scores = np.maximum(0.0, np.minimum(pattern_density * 10, 1.0) - fact_check_ratio * 0.3)
+        
+        persuasion_counts = persuasion_sums[ends] - persuasion_sums[starts]
+        persuasion_scores = np.minimum(1.0, persuasion_counts / max(window_size / 10, 1))
+        
+        return RiskHeatmapResult(
+            window_size=window_size,
+            stride=stride,
+            total_words=total_words,
+            window_starts=starts.tolist(),
+            misinformation_scores=np.round(misinformation_scores, 4).tolist(),
+            persuasion_scores=np.round(persuasion_scores, 4).tolist()
+        )
+    
+    def _token_prefix_sums(self, text: str, token_starts: np.ndarray, regexes: List[Pattern]) -> np.ndarray:
+        """
+        Count matches per token and return prefix sums of length len(token_starts) + 1.
+        """
+        match_starts = []
+        for regex in regexes:
+            with profiling.pattern(regex.pattern):
+                match_starts.extend(m.start() for m in regex.finditer(text))
+        if not match_starts:
+            return np.zeros(len(token_starts) + 1, dtype=np.int64)
+        
+        # A match belongs to the token whose start offset precedes it
+        token_index = np.searchsorted(token_starts, np.array(match_starts, dtype=np.int64), side='right') - 1
+        token_index = np.clip(token_index, 0, len(token_starts) - 1)
+        counts = np.bincount(token_index, minlength=len(token_starts))
+        return np.concatenate(([0], np.cumsum(counts)))
+    
     def _generate_explanation(self, patterns: List[str], score: float, fact_check_count: int) -> str:
         """
         Generate human-readable explanation of the detection results.
@@ -5,6 +5,7 @@ Persuasion technique analysis service for SafeDose.ai
 import re
 from typing import List
 from app.models.ai_models import PersuasionAnalysisResult
+from app.utils import profiling
 
 class PersuasionEngine:
     def __init__(self):
@@ -20,7 +21,8 @@ class PersuasionEngine:
                 r'\b(because|therefore|thus|consequently|as a result)\b',
                 r'\b(evidence|proof|data|statistics|research)\b',
                 r'\b(logic|reason|rational|sensible)\b',
-                r'\b(if.*then|when.*then|since.*then)\b'
+                # Bounded to one sentence: an unbounded .* backtracks quadratically on long texts
+                r'\b((?:if|when|since)\b[^.!?\n]{0,200}?\bthen)\b'
             ],
             'credibility_appeal': [
                 r'\b(expert|authority|scientist|doctor|professor)\b',
@@ -48,6 +50,7 @@ class PersuasionEngine:
             ]
         }
         
+    @profiling.profiled("persuasion_engine.analyze")
     async def analyze(self, text: str) -> PersuasionAnalysisResult:
         """
         Analyze persuasion techniques in the given text.
@@ -64,7 +67,7 @@ class PersuasionEngine:
             technique_matches = 0
             
             for pattern in patterns:
-                matches = re.findall(pattern, text_lower, re.IGNORECASE)
+                matches = profiling.findall(pattern, text_lower, re.IGNORECASE)
                 technique_matches += len(matches)
             
             if technique_matches > 0:
@@ -80,7 +83,7 @@ class PersuasionEngine:
         
         # Calculate overall persuasion score
         total_words = len(text.split())
-        total_techniques = sum(len(re.findall(pattern, text_lower, re.IGNORECASE)) 
+        total_techniques = sum(len(profiling.findall(pattern, text_lower, re.IGNORECASE)) 
                              for patterns in self.persuasion_techniques.values() 
                              for pattern in patterns)
         
@@ -6,9 +6,12 @@ import re
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 from app.models.ai_models import TrustedMessengerResult
+from app.services.fact_check_index import FactCheckIndex, load_fact_check_index
+from app.utils.helpers import extract_keywords
+from app.utils import profiling
 
 class TrustedMessenger:
-    def __init__(self):
+    def __init__(self, fact_check_index: Optional[FactCheckIndex] = None):
         # Trusted fact-checking sources
         self.fact_check_sources = [
             'snopes.com',
@@ -56,6 +59,10 @@ class TrustedMessenger:
             'nasa.gov'
         ]
         
+        # Local fact-check article corpus (None when no corpus is configured)
+        self.fact_check_index = fact_check_index if fact_check_index is not None else load_fact_check_index()
+        
+    @profiling.profiled("trusted_messenger.get_alternatives")
     async def get_alternatives(self, text: str, source_url: Optional[str] = None) -> TrustedMessengerResult:
         """
         Get trusted alternatives and fact-checking resources for the given text.
@@ -70,7 +77,7 @@ class TrustedMessenger:
         alternative_sources = self._get_alternative_sources(topics)
         
         # Generate fact-check links
-        fact_check_links = self._get_fact_check_links(topics)
+        fact_check_links = self._get_fact_check_links(topics, extract_keywords(text))
         
         # Calculate trust score
         trust_score = self._calculate_trust_score(source_verification, len(alternative_sources))
@@ -174,10 +181,18 @@ class TrustedMessenger:
         unique_sources = list(set(sources))
         return unique_sources[:10]
     
-    def _get_fact_check_links(self, topics: List[str]) -> List[str]:
+    def _get_fact_check_links(self, topics: List[str], keywords: Optional[List[str]] = None,
+                              max_links: int = 5) -> List[str]:
         """
         Get relevant fact-checking links for the given topics.
         """
+        # Prefer specific articles from the local corpus when one is loaded
+        if self.fact_check_index is not None:
+            with profiling.stage("trusted_messenger.fact_check_search"):
+                articles = self.fact_check_index.search(topics + (keywords or []), k=max_links)
+            if articles:
+                return [article['url'] for article in articles]
+        
         base_urls = [
             'https://www.snopes.com',
             'https://www.factcheck.org',
@@ -185,8 +200,7 @@ class TrustedMessenger:
             'https://www.reuters.com/fact-check'
         ]
         
-        # In a real implementation, you would search these sites for specific topics
-        # For now, return the base URLs
+        # Fall back to the fact-checking homepages
         return base_urls
     
     def _calculate_trust_score(self, source_verification: Dict[str, Any], num_alternatives: int) -> float:
@@ -4,6 +4,7 @@ Helper utility functions for SafeDose.ai
 
 import re
 import hashlib
+import unicodedata
 from typing import List, Dict, Any
 from datetime import datetime
 
@@ -19,21 +20,25 @@ def clean_text(text: str) -> str:
     
     return text
 
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those'
+}
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words, dropping stop words and very short words.
+    """
+    words = re.findall(r'\b\w+\b', text.lower())
+    return [word for word in words if word not in STOP_WORDS and len(word) > 2]
+
 def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     """
     Extract key keywords from text.
     """
-    # Remove common stop words
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those'
-    }
-    
-    # Split text into words and filter
-    words = re.findall(r'\b\w+\b', text.lower())
-    keywords = [word for word in words if word not in stop_words and len(word) > 2]
+    keywords = tokenize(text)
     
     # Count frequency
     word_count = {}
@@ -59,6 +64,30 @@ def calculate_similarity(text1: str, text2: str) -> float:
     
     return len(intersection) / len(union)
 
+# Whitespace for content hashing is an explicit list rather than \s, whose
+# meaning differs between Python and JavaScript; chrome-extension/content-hash.js
+# uses the same list.
+HASH_WHITESPACE = re.compile(
+    '[\t\n\x0b\x0c\r \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+'
+)
+LONE_SURROGATE = re.compile('[\ud800-\udfff]')
+
+def normalize_for_hash(text: str) -> str:
+    """
+    Normalize text before content hashing: NFC, whitespace runs to one space, trimmed.
+    """
+    text = unicodedata.normalize('NFC', text)
+    text = HASH_WHITESPACE.sub(' ', text).strip(' ')
+
+    # TextEncoder in the browser encodes unpaired surrogates as U+FFFD
+    return LONE_SURROGATE.sub('\ufffd', text)
+
+def content_hash(text: str) -> str:
+    """
+    SHA-256 hex digest of the normalized text, shared with the browser extension.
+    """
+    return hashlib.sha256(normalize_for_hash(text).encode('utf-8')).hexdigest()
+
 def generate_analysis_id(text: str, user_id: int = None) -> str:
     """
     Generate a unique analysis ID.
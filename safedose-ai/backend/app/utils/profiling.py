@@ -0,0 +1,257 @@
+"""
+On-demand per-request profiling for SafeDose.ai
+
+A request is profiled when it carries the admin header
+(X-SafeDose-Profile: <PROFILE_ADMIN_TOKEN>) or is picked by PROFILE_SAMPLE_RATE.
+While it runs, a background thread samples stacks into collapsed-stack
+("folded") format for flamegraph.pl or speedscope, and the endpoints and
+services report per-stage and per-pattern timings through stage(),
+profiled(), pattern() and findall(). Samples and timings are written to
+PROFILE_OUTPUT_DIR.
+
+The sampler reads the event-loop thread for the whole request, plus any
+worker thread while it is inside one of the request's stages (sync endpoints
+such as /risk-heatmap run in FastAPI's threadpool). Two limits follow:
+the event loop is shared, so stacks of other requests it interleaves are
+included; and the sampler needs the GIL, which re's C matcher holds for a
+whole search, so regex time is under-sampled. Stage and pattern timings
+are measured directly and are the reliable figures for both.
+
+Pattern timings come only from routes that run the detectors; of the API
+routes that is /risk-heatmap. /analyze, /detect-misinformation,
+/analyze-persuasion and /get-trusted-alternatives are still mocks and
+record only their endpoint stages.
+
+With neither setting configured the middleware is not installed at all, and the
+service hooks reduce to a context-variable lookup.
+"""
+
+import os
+import re
+import sys
+import hmac
+import json
+import time
+import uuid
+import random
+import threading
+import functools
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Set, Any
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_HEADER = "x-safedose-profile"
+
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default=None)
+
+class StackSampler(threading.Thread):
+    """
+    Periodically captures the Python stacks of a profile's threads as folded stack counts.
+    """
+
+    def __init__(self, thread_ids: Set[int], interval: float):
+        super().__init__(name="safedose-profiler", daemon=True)
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+class RequestProfile:
+    """
+    Stage and pattern timings collected for a single profiled request.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.stages: Dict[str, float] = {}
+        self.patterns: Dict[str, List[float]] = {}
+        # Threads currently doing this request's work, read by the StackSampler
+        self.thread_ids: Set[int] = set()
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_pattern(self, regex: str, seconds: float) -> None:
+        entry = self.patterns.setdefault(regex, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def summary(self, duration: float, samples: int) -> Dict[str, Any]:
+        stages = sorted(self.stages.items(), key=lambda item: item[1], reverse=True)
+        patterns = sorted(self.patterns.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            'profile_id': self.profile_id,
+            'method': self.method,
+            'path': self.path,
+            'duration_ms': round(duration * 1000, 3),
+            'samples': samples,
+            # The whole-request stage always wins, so report the slowest one inside it
+            'slowest_stage': next((name for name, _ in stages if name != 'request'), None),
+            'slowest_pattern': patterns[0][0] if patterns else None,
+            'stages': {name: round(seconds * 1000, 3) for name, seconds in stages},
+            'patterns': [
+                {'pattern': regex, 'total_ms': round(seconds * 1000, 3), 'calls': calls}
+                for regex, (seconds, calls) in patterns[:20]
+            ]
+        }
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a block as a named stage of the current profiled request, if any.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    # Stages entered on a threadpool thread make the sampler follow that thread too
+    thread_id = threading.get_ident()
+    entered = thread_id not in profile.thread_ids
+    if entered:
+        profile.thread_ids.add(thread_id)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, time.perf_counter() - started)
+        if entered:
+            profile.thread_ids.discard(thread_id)
+
+def profiled(name: str):
+    """
+    Decorator that times an async service method as a stage.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _active_profile.get() is None:
+                return await func(*args, **kwargs)
+            with stage(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def pattern(regex: str):
+    """
+    Time a block as work done by the given regex pattern, if profiling.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_pattern(regex, time.perf_counter() - started)
+
+def findall(regex: str, text: str, flags: int = 0) -> List[Any]:
+    """
+    re.findall that records its duration against the pattern when profiling.
+    """
+    if _active_profile.get() is None:
+        return re.findall(regex, text, flags)
+    with pattern(regex):
+        return re.findall(regex, text, flags)
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests selected by header or sampling rate.
+    """
+
+    def __init__(self, app, admin_token: str = "", sample_rate: float = 0.0,
+                 output_dir: str = "profiles", interval: float = 0.001):
+        self.app = app
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.interval = interval
+
+    def _should_profile(self, scope) -> bool:
+        if self.admin_token:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_HEADER.encode() and hmac.compare_digest(value, self.admin_token.encode()):
+                    return True
+        # A missing or wrong token leaves the request to the normal sampling rate
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope.get("method", ""), scope.get("path", ""))
+        token = _active_profile.set(profile)
+        sampler = StackSampler(profile.thread_ids, self.interval)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.profile_id.encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            with stage("request"):
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            duration = time.perf_counter() - started
+            _active_profile.reset(token)
+            # Joining the sampler and writing files block, so keep them off the event loop
+            await run_in_threadpool(self._finish, profile, sampler, duration)
+
+    def _finish(self, profile: RequestProfile, sampler: StackSampler, duration: float) -> None:
+        sampler.stop()
+        self._write(profile, sampler, duration)
+
+    def _write(self, profile: RequestProfile, sampler: StackSampler, duration: float) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{profile.profile_id}")
+
+        with open(f"{base}.folded", "w") as f:
+            for stack, count in sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(f"{base}.json", "w") as f:
+            json.dump(profile.summary(duration, sum(sampler.counts.values())), f, indent=2)
+
+def install_profiling(app) -> None:
+    """
+    Add the profiling middleware when PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE is set.
+    """
+    admin_token = os.getenv("PROFILE_ADMIN_TOKEN", "")
+    sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    if not admin_token and sample_rate <= 0:
+        return
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        admin_token=admin_token,
+        sample_rate=sample_rate,
+        output_dir=os.getenv("PROFILE_OUTPUT_DIR", "profiles"),
+        interval=float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+    )
@@ -0,0 +1,116 @@
+"""
+Latency benchmark for the fact-check corpus index.
+
+Builds a synthetic corpus in which every article mixes words from one topic
+with a Zipf-distributed general vocabulary (so common terms have posting lists
+spanning most of the corpus), then times FactCheckIndex.search for queries
+built the way TrustedMessenger builds them: extract_keywords() over an
+article-length text about one topic. Exits non-zero when the p95 latency of
+any query size is above --max-p95-ms.
+
+Usage:
+    python scripts/benchmark_fact_check_index.py --articles 1000000 --max-p95-ms 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from itertools import accumulate
+from typing import List, Optional
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.fact_check_index import FactCheckIndex
+from app.utils.helpers import extract_keywords
+
+class SyntheticCorpus:
+    def __init__(self, rng: random.Random, vocabulary_size: int, topics: int, topic_words: int):
+        self.rng = rng
+        self.vocabulary = [f"word{i}" for i in range(vocabulary_size)]
+        self.cum_weights = list(accumulate(1 / (rank + 1) for rank in range(vocabulary_size)))
+        self.topics = [rng.sample(self.vocabulary, topic_words) for _ in range(topics)]
+        self.topic_cum_weights = list(accumulate(1 / (rank + 1) for rank in range(topic_words)))
+
+    def words(self, topic: int, count: int) -> List[str]:
+        on_topic = self.rng.choices(self.topics[topic], cum_weights=self.topic_cum_weights, k=count // 2)
+        general = self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=count - count // 2)
+        return on_topic + general
+
+    def article_length(self) -> int:
+        # Titles and short claims through to long write-ups
+        return max(6, int(self.rng.lognormvariate(3.5, 0.7)))
+
+def build_index(corpus: SyntheticCorpus, articles: int) -> FactCheckIndex:
+    index = FactCheckIndex()
+    for doc_id in range(articles):
+        words = corpus.words(corpus.rng.randrange(len(corpus.topics)), corpus.article_length())
+        index.add(f"https://factcheck.example/{doc_id}", " ".join(words[:8]), " ".join(words[8:]))
+    return index
+
+def time_queries(index: FactCheckIndex, queries: List[List[str]]) -> List[float]:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, k=5)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FactCheckIndex.search latency")
+    parser.add_argument("--articles", type=int, default=1000000, help="Synthetic articles to index")
+    parser.add_argument("--vocabulary", type=int, default=100000, help="Distinct terms in the corpus")
+    parser.add_argument("--topics", type=int, default=2000, help="Topics articles are drawn from")
+    parser.add_argument("--query-sizes", default="2,5,12", help="Comma-separated query term counts")
+    parser.add_argument("--query-words", type=int, default=200, help="Words in the text queries are extracted from")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per query size")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Fail if any p95 latency exceeds this")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    corpus = SyntheticCorpus(random.Random(args.seed), args.vocabulary, args.topics, topic_words=300)
+
+    started = time.perf_counter()
+    index = build_index(corpus, args.articles)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index.prepare()
+    prepare_seconds = time.perf_counter() - started
+
+    report = {
+        'articles': args.articles,
+        'vocabulary': args.vocabulary,
+        'build_seconds': round(build_seconds, 2),
+        'prepare_seconds': round(prepare_seconds, 2),
+        'queries': {}
+    }
+    failed = False
+    for size in (int(s) for s in args.query_sizes.split(",")):
+        queries = [
+            extract_keywords(" ".join(corpus.words(corpus.rng.randrange(args.topics), args.query_words)), max_keywords=size)
+            for _ in range(args.queries)
+        ]
+        latencies = time_queries(index, queries)
+        p95 = float(np.percentile(latencies, 95))
+        report['queries'][size] = {
+            'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+            'p95_ms': round(p95, 3),
+            'max_ms': round(max(latencies), 3)
+        }
+        if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+            failed = True
+
+    print(json.dumps(report, indent=2))
+    if failed:
+        print(f"p95 latency above {args.max_p95_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
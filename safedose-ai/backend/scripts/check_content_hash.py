@@ -0,0 +1,90 @@
+"""
+Check the server and extension content hashes against the shared test vectors.
+
+The Python implementation (app/utils/helpers.py) is checked in-process; the
+extension implementation (chrome-extension/content-hash.js) is run with Node.js
+when it is installed, or required with --require-node.
+
+Usage:
+    python scripts/check_content_hash.py [--require-node]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+from typing import List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BACKEND_DIR)
+VECTORS_PATH = os.path.join(PROJECT_DIR, "shared", "content-hash-vectors.json")
+EXTENSION_HASH_JS = os.path.join(PROJECT_DIR, "chrome-extension", "content-hash.js")
+
+sys.path.insert(0, BACKEND_DIR)
+
+from app.utils.helpers import normalize_for_hash, content_hash
+
+NODE_CHECK = """
+const fs = require("fs");
+const { normalizeForHash, contentHash } = require(process.argv[1]);
+const { vectors } = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+(async () => {
+  const failures = [];
+  for (const vector of vectors) {
+    const normalized = normalizeForHash(vector.input);
+    const hash = await contentHash(vector.input);
+    if (normalized !== vector.normalized || hash !== vector.sha256) {
+      failures.push(`${vector.name}: got ${hash}, expected ${vector.sha256}`);
+    }
+  }
+  console.log(JSON.stringify({ checked: vectors.length, failures }));
+})();
+"""
+
+def check_python(vectors: List[dict]) -> List[str]:
+    failures = []
+    for vector in vectors:
+        if normalize_for_hash(vector["input"]) != vector["normalized"]:
+            failures.append(f"{vector['name']}: normalized text differs")
+        elif content_hash(vector["input"]) != vector["sha256"]:
+            failures.append(f"{vector['name']}: got {content_hash(vector['input'])}, expected {vector['sha256']}")
+    return failures
+
+def check_node(node: str) -> List[str]:
+    output = subprocess.run(
+        [node, "-e", NODE_CHECK, EXTENSION_HASH_JS, VECTORS_PATH],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)["failures"]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check content hashes against the shared test vectors")
+    parser.add_argument("--require-node", action="store_true", help="Fail if Node.js is not available")
+    args = parser.parse_args(argv)
+
+    with open(VECTORS_PATH, encoding="utf-8") as f:
+        vectors = json.load(f)["vectors"]
+
+    results = {"python": check_python(vectors)}
+    node = shutil.which("node")
+    if node:
+        results["extension"] = check_node(node)
+    elif args.require_node:
+        print("Node.js not found; cannot check chrome-extension/content-hash.js", file=sys.stderr)
+        return 1
+
+    ok = True
+    for side, failures in results.items():
+        status = "ok" if not failures else f"{len(failures)} failed"
+        print(f"{side}: {len(vectors)} vectors, {status}")
+        for failure in failures:
+            print(f"  {failure}")
+        ok = ok and not failures
+    if not node:
+        print("extension: skipped (Node.js not found)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+End-to-end HTTP load test for the SafeDose.ai API.
+
+Starts the app through app/main.py on a free port (unless --url points at a
+running server; --production starts the multi-worker mode) with a throwaway
+SQLite database, checks that the started process is the one answering, drives
+the analysis endpoints with a configurable request mix, concurrency and
+text-size distribution, and writes per-endpoint throughput and latency
+percentiles as JSON so results can be compared across releases.
+
+Usage:
+    python scripts/load_test.py --concurrency 32 --duration 60 \
+        --mix analyze=4,detect-misinformation=2,analyze-persuasion=2,get-trusted-alternatives=1 \
+        --text-sizes 50:0.5,500:0.4,5000:0.1 --output results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import asyncio
+import socket
+import argparse
+import platform
+import shutil
+import tempfile
+import subprocess
+from typing import List, Dict, Any, Optional, Tuple
+import aiohttp
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = "analyze=4,detect-misinformation=2,analyze-persuasion=2,get-trusted-alternatives=1"
+DEFAULT_TEXT_SIZES = "50:0.5,500:0.4,5000:0.1"
+
+# Ordinary prose mixed with words the detectors look for, so every code path gets exercised
+WORD_POOL = (
+    "the report said officials will review new data on vaccine safety and climate policy "
+    "next week while researchers compare results across several studies and regions "
+    "shocking secret cover-up miracle breakthrough big pharma experts say act now "
+    "everyone is sharing this viral story limited time official government must because "
+    "evidence shows therefore scientists at the university found trusted proven results"
+).split()
+
+def parse_weights(spec: str, value_type=str) -> List[Tuple[Any, float]]:
+    """
+    Parse "key=weight,key=weight" (or "key:weight") into a list of pairs.
+    """
+    pairs = []
+    for item in spec.split(","):
+        key, _, weight = item.replace(":", "=").partition("=")
+        pairs.append((value_type(key.strip()), float(weight or 1)))
+    return pairs
+
+def generate_text(rng: random.Random, word_count: int) -> str:
+    """
+    Build a pseudo-article of the given length from the word pool.
+    """
+    return " ".join(rng.choices(WORD_POOL, k=word_count)) + "."
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies (seconds) as milliseconds.
+    """
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3)
+    }
+
+def find_free_port(host: str) -> int:
+    """
+    Ask the OS for a port nothing is listening on.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+def port_in_use(host: str, port: int) -> bool:
+    """
+    Whether something already listens on the port, which would answer the health check
+    in place of the server we start.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex((host, port)) == 0
+
+def start_server(host: str, port: int, production: bool, log_file, data_dir: str) -> subprocess.Popen:
+    """
+    Launch the API through the main.py entry point in its own process group.
+
+    The server stores analyses in a fresh SQLite database under data_dir, so a
+    run neither writes to the developer's database nor depends on its size.
+    """
+    database_url = f"sqlite:///{os.path.join(data_dir, 'safedose.db')}"
+    env = dict(os.environ, API_HOST=host, API_PORT=str(port), DATABASE_URL=database_url)
+    command = [sys.executable, "-m", "app.main"] + (["--production"] if production else [])
+    return subprocess.Popen(
+        command,
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        start_new_session=True
+    )
+
+def log_tail(path: str, lines: int = 20) -> str:
+    """
+    Last lines of the server log, for error messages.
+    """
+    with open(path, errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+def stop_server(process: subprocess.Popen) -> None:
+    """
+    Stop the server and any reloader children.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+async def wait_for_health(session: aiohttp.ClientSession, base_url: str, timeout: float,
+                          server: Optional[subprocess.Popen] = None) -> None:
+    """
+    Poll the health endpoint until the server answers, failing if the started server exits.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode} before becoming healthy")
+        try:
+            async with session.get(f"{base_url}/health") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout:.0f}s")
+
+async def run_load(base_url: str, args: argparse.Namespace,
+                   server: Optional[subprocess.Popen] = None) -> Dict[str, Any]:
+    """
+    Drive the endpoints and collect per-endpoint latency samples.
+    """
+    mix = parse_weights(args.mix)
+    sizes = parse_weights(args.text_sizes, int)
+    endpoints = [name for name, _ in mix]
+    endpoint_weights = [weight for _, weight in mix]
+    size_values = [size for size, _ in sizes]
+    size_weights = [weight for _, weight in sizes]
+
+    # Pre-generate request bodies so text generation is not measured
+    rng = random.Random(args.seed)
+    bodies = [
+        json.dumps({"text": generate_text(rng, size), "source_url": "https://example.com/article"}).encode()
+        for size in rng.choices(size_values, size_weights, k=args.body_pool)
+    ]
+
+    latencies: Dict[str, List[float]] = {name: [] for name in endpoints}
+    errors: Dict[str, int] = {name: 0 for name in endpoints}
+    bytes_sent: Dict[str, int] = {name: 0 for name in endpoints}
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    headers = {"Content-Type": "application/json"}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        await wait_for_health(session, base_url, args.startup_timeout, server)
+
+        warmup_end = time.monotonic() + args.warmup
+        end = warmup_end + args.duration
+        remaining = [args.requests] if args.requests else None
+
+        async def worker(worker_id: int) -> None:
+            worker_rng = random.Random(args.seed + worker_id + 1)
+            while True:
+                now = time.monotonic()
+                if remaining is None and now >= end:
+                    return
+                measuring = now >= warmup_end
+                if remaining is not None and measuring:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+
+                endpoint = worker_rng.choices(endpoints, endpoint_weights)[0]
+                body = worker_rng.choice(bodies)
+                started = time.perf_counter()
+                try:
+                    async with session.post(f"{base_url}/{endpoint}", data=body) as response:
+                        await response.read()
+                        ok = response.status == 200
+                except aiohttp.ClientError:
+                    ok = False
+                elapsed = time.perf_counter() - started
+
+                if not measuring:
+                    continue
+                if ok:
+                    latencies[endpoint].append(elapsed)
+                    bytes_sent[endpoint] += len(body)
+                else:
+                    errors[endpoint] += 1
+
+        started_at = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        wall_time = max(time.monotonic() - max(started_at, warmup_end), 1e-9)
+
+    per_endpoint = {}
+    for name in endpoints:
+        per_endpoint[name] = {
+            "requests": len(latencies[name]),
+            "errors": errors[name],
+            "throughput_rps": round(len(latencies[name]) / wall_time, 2),
+            "mean_request_bytes": round(bytes_sent[name] / max(len(latencies[name]), 1), 1),
+            **percentiles(latencies[name])
+        }
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "config": {
+            "base_url": base_url,
+            "production": args.production,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "requests": args.requests,
+            "warmup_s": args.warmup,
+            "mix": dict(mix),
+            "text_sizes": {str(size): weight for size, weight in sizes},
+            "seed": args.seed
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "wall_time_s": round(wall_time, 3),
+        "total": {
+            "requests": len(all_latencies),
+            "errors": sum(errors.values()),
+            "throughput_rps": round(len(all_latencies) / wall_time, 2),
+            **percentiles(all_latencies)
+        },
+        "endpoints": per_endpoint
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the SafeDose.ai API")
+    parser.add_argument("--url", help="Base URL of a running API (e.g. http://localhost:8001/api/v1); "
+                                      "when omitted the app is started through main.py")
+    parser.add_argument("--host", default="127.0.0.1", help="Host for the locally started server")
+    parser.add_argument("--port", type=int, default=None, help="Port for the locally started server "
+                                                                "(default: a free port)")
+    parser.add_argument("--production", action="store_true",
+                        help="Start the server in multi-worker production mode (main.py --production)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds (ignored with --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many measured requests")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of unmeasured warm-up traffic")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Endpoint weights, e.g. analyze=4,detect-misinformation=1")
+    parser.add_argument("--text-sizes", default=DEFAULT_TEXT_SIZES, help="Word counts and weights, e.g. 50:0.5,5000:0.5")
+    parser.add_argument("--body-pool", type=int, default=256, help="Number of distinct pre-generated request bodies")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for texts and request order")
+    parser.add_argument("--startup-timeout", type=float, default=30, help="Seconds to wait for the server to come up")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    server = None
+    log_path = None
+    data_dir = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = args.port or find_free_port(args.host)
+        if port_in_use(args.host, port):
+            print(f"Port {port} is already in use; pass a free --port or --url to test a running server",
+                  file=sys.stderr)
+            return 1
+        base_url = f"http://{args.host}:{port}/api/v1"
+        data_dir = tempfile.mkdtemp(prefix="safedose-load-")
+        with tempfile.NamedTemporaryFile("w", prefix="safedose-server-", suffix=".log", delete=False) as log_file:
+            log_path = log_file.name
+            server = start_server(args.host, port, args.production, log_file, data_dir)
+    try:
+        report = asyncio.run(run_load(base_url, args, server))
+    except RuntimeError as e:
+        print(f"{e}", file=sys.stderr)
+        if log_path:
+            print(f"Server log ({log_path}):\n{log_tail(log_path)}", file=sys.stderr)
+        return 1
+    finally:
+        if server is not None:
+            stop_server(server)
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    if log_path:
+        os.unlink(log_path)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0 if report["total"]["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Offline batch scorer for large archives of posts.
+
+Streams CSV, JSONL or Parquet input in chunks, scores every text with
+MisinformationDetector, PersuasionEngine and TrustedMessenger in a process
+pool, and appends results to a JSONL or CSV file as chunks complete. A
+progress file next to the output records how many chunks have been written,
+so an interrupted run picks up where it stopped with --resume, provided the
+input file and the column, chunk-size and output-format options are unchanged.
+
+Usage:
+    python scripts/score_corpus.py posts.parquet scores.jsonl --text-column body --workers 8
+    python scripts/score_corpus.py posts.csv scores.jsonl --resume
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import signal
+import asyncio
+import argparse
+from collections import deque
+from multiprocessing import Pool
+from typing import Iterator, List, Dict, Any, Optional
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import MisinformationDetector, PersuasionEngine, TrustedMessenger
+from app.services.fact_check_index import load_fact_check_index
+
+OUTPUT_FIELDS = [
+    'id', 'misinformation_score', 'misinformation_confidence', 'persuasion_score',
+    'emotional_appeal', 'logical_appeal', 'credibility_appeal', 'trust_score',
+    'detected_patterns', 'techniques_detected', 'fact_check_links'
+]
+
+# Per-process services, created once by the pool initializer
+_services: Dict[str, Any] = {}
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream the input file as DataFrames of at most chunk_size rows.
+    """
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif lower.endswith(('.jsonl', '.ndjson')):
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif lower.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Reading Parquet requires pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise SystemExit(f"Unsupported input format: {path} (expected .csv, .jsonl or .parquet)")
+
+def _init_worker() -> None:
+    # Ctrl-C is handled by the parent, which stops submitting and keeps what was written
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _services['loop'] = asyncio.new_event_loop()
+    _services['detector'] = MisinformationDetector()
+    _services['persuasion'] = PersuasionEngine()
+    _services['messenger'] = TrustedMessenger()
+
+async def _score_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    detector = _services['detector']
+    persuasion = _services['persuasion']
+    messenger = _services['messenger']
+
+    results = []
+    for row in rows:
+        text = row['text']
+        misinformation = await detector.detect(text)
+        persuasion_result = await persuasion.analyze(text)
+        trusted = await messenger.get_alternatives(text, row['source_url'] or None)
+        results.append({
+            'id': row['id'],
+            'misinformation_score': misinformation.score,
+            'misinformation_confidence': misinformation.confidence,
+            'persuasion_score': persuasion_result.score,
+            'emotional_appeal': persuasion_result.emotional_appeal,
+            'logical_appeal': persuasion_result.logical_appeal,
+            'credibility_appeal': persuasion_result.credibility_appeal,
+            'trust_score': trusted.trust_score,
+            'detected_patterns': misinformation.detected_patterns,
+            'techniques_detected': persuasion_result.techniques_detected,
+            'fact_check_links': trusted.fact_check_links
+        })
+    return results
+
+def score_chunk(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Score one chunk of rows inside a pool worker.
+    """
+    return _services['loop'].run_until_complete(_score_rows(rows))
+
+def chunk_to_rows(chunk: pd.DataFrame, start: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Reduce a DataFrame chunk to the plain fields the workers need.
+    """
+    if args.text_column not in chunk.columns:
+        raise SystemExit(f"Input has no column '{args.text_column}' (columns: {', '.join(map(str, chunk.columns))})")
+
+    texts = chunk[args.text_column].fillna('').astype(str).tolist()
+    if args.id_column and args.id_column in chunk.columns:
+        ids = chunk[args.id_column].tolist()
+    else:
+        ids = list(range(start, start + len(chunk)))
+    if args.url_column and args.url_column in chunk.columns:
+        urls = chunk[args.url_column].fillna('').astype(str).tolist()
+    else:
+        urls = [''] * len(chunk)
+
+    return [{'id': i, 'text': t, 'source_url': u} for i, t, u in zip(ids, texts, urls)]
+
+def _json_default(value):
+    # numpy/pandas scalars coming from the id column
+    return value.item() if hasattr(value, 'item') else str(value)
+
+class ResultWriter:
+    """
+    Append-only JSONL/CSV writer with a progress file for resuming.
+    """
+
+    def __init__(self, path: str, resume: bool, run_key: Dict[str, Any]):
+        self.path = path
+        self.run_key = run_key
+        self.progress_path = f"{path}.progress"
+        self.is_csv = path.lower().endswith('.csv')
+        self.chunks_done = 0
+        self.rows_done = 0
+
+        offset = 0
+        if resume and os.path.exists(self.progress_path):
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+            previous = progress.get('run') or {}
+            changed = sorted(key for key in set(previous) | set(run_key) if previous.get(key) != run_key.get(key))
+            if changed:
+                details = ", ".join(f"{key}: {previous.get(key)!r} -> {run_key.get(key)!r}" for key in changed)
+                raise SystemExit(f"Cannot resume {self.path}; the run settings changed ({details})")
+            self.chunks_done = progress['chunks_done']
+            self.rows_done = progress['rows_done']
+            offset = progress['output_offset']
+        elif os.path.exists(path) and resume:
+            raise SystemExit(f"Cannot resume {path}; {self.progress_path} is missing, so its progress is unknown. "
+                             f"Remove {path} to start over")
+        elif os.path.exists(path):
+            raise SystemExit(f"{path} already exists; pass --resume to continue it or remove it")
+
+        # Drop anything written after the last recorded chunk
+        self.file = open(path, 'a+', newline='' if self.is_csv else None, encoding='utf-8')
+        self.file.truncate(offset)
+        self.file.seek(offset)
+        self.csv_writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS) if self.is_csv else None
+        if self.is_csv and offset == 0:
+            self.csv_writer.writeheader()
+
+    def write_chunk(self, results: List[Dict[str, Any]]) -> None:
+        for result in results:
+            if self.is_csv:
+                self.csv_writer.writerow({
+                    key: json.dumps(value) if isinstance(value, list) else value
+                    for key, value in result.items()
+                })
+            else:
+                self.file.write(json.dumps(result, default=_json_default) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+        self.chunks_done += 1
+        self.rows_done += len(results)
+        self._save_progress()
+
+    def _save_progress(self) -> None:
+        progress = {
+            'run': self.run_key,
+            'chunks_done': self.chunks_done,
+            'rows_done': self.rows_done,
+            'output_offset': self.file.tell()
+        }
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(progress, f)
+        os.replace(tmp_path, self.progress_path)
+
+    def close(self) -> None:
+        self.file.close()
+
+def make_run_key(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Everything that decides which rows land in which chunk and how they are written;
+    a run can only be resumed with all of it unchanged.
+    """
+    stat = os.stat(args.input)
+    return {
+        'input': os.path.abspath(args.input),
+        'input_size': stat.st_size,
+        'input_mtime_ns': stat.st_mtime_ns,
+        'chunk_size': args.chunk_size,
+        'text_column': args.text_column,
+        'id_column': args.id_column,
+        'url_column': args.url_column,
+        'output_format': 'csv' if args.output.lower().endswith('.csv') else 'jsonl',
+        'fact_check_corpus': os.getenv('FACT_CHECK_CORPUS_PATH', '')
+    }
+
+def run(args: argparse.Namespace) -> int:
+    run_key = make_run_key(args)
+    writer = ResultWriter(args.output, args.resume, run_key)
+    skip_chunks = writer.chunks_done
+    if skip_chunks:
+        print(f"Resuming after {skip_chunks} chunks ({writer.rows_done} rows)", file=sys.stderr)
+
+    # Load the fact-check corpus before the pool forks so workers share it
+    load_fact_check_index()
+
+    started = time.monotonic()
+    scored = 0
+    pending = deque()
+    max_pending = args.workers * 2
+    pool = Pool(args.workers, initializer=_init_worker)
+    try:
+        row_offset = 0
+        for index, chunk in enumerate(read_chunks(args.input, args.chunk_size)):
+            start = row_offset
+            row_offset += len(chunk)
+            if index < skip_chunks:
+                continue
+
+            pending.append(pool.apply_async(score_chunk, (chunk_to_rows(chunk, start, args),)))
+
+            # Keep a bounded number of chunks in flight and write them in input order
+            while len(pending) >= max_pending or (pending and pending[0].ready()):
+                results = pending.popleft().get()
+                writer.write_chunk(results)
+                scored += len(results)
+
+        while pending:
+            results = pending.popleft().get()
+            writer.write_chunk(results)
+            scored += len(results)
+        pool.close()
+        pool.join()
+    except KeyboardInterrupt:
+        # Everything up to the last written chunk is recorded in the progress file
+        print(f"Interrupted; rerun with --resume to continue after row {writer.rows_done}", file=sys.stderr)
+        return 130
+    finally:
+        writer.close()
+        pool.terminate()
+
+    elapsed = time.monotonic() - started
+    print(f"Scored {scored} rows in {elapsed:.1f}s ({scored / max(elapsed, 1e-9):.0f} rows/s); "
+          f"{writer.rows_done} rows total in {args.output}", file=sys.stderr)
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score an archive of texts offline")
+    parser.add_argument("input", help="Input file (.csv, .jsonl or .parquet)")
+    parser.add_argument("output", help="Output file (.jsonl or .csv), appended chunk by chunk")
+    parser.add_argument("--text-column", default="text", help="Column holding the text to score")
+    parser.add_argument("--id-column", default="id", help="Column copied to the output id (row number if missing)")
+    parser.add_argument("--url-column", default="source_url", help="Optional column with the source URL")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per chunk sent to a worker")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its progress file")
+    args = parser.parse_args(argv)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
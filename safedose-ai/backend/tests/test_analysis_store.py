@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints import TextAnalysisResponse
+from app.models.database import Analysis
+from app.services.analysis_store import AnalysisStore
+from app.utils.helpers import content_hash
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}", connect_args={"check_same_thread": False})
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+def make_response(text):
+    return TextAnalysisResponse(
+        analysis_id=1,
+        misinformation_score=0.4,
+        persuasion_score=0.3,
+        trust_score=0.65,
+        analysis_result="Analysis complete.",
+        recommendations=["Always verify important information."],
+        created_at=datetime(2024, 1, 1),
+        content_hash=content_hash(text)
+    )
+
+def test_result_is_shared_between_workers(session_factory):
+    # Two stores on one database stand in for two server workers
+    first, second = AnalysisStore(session_factory=session_factory), AnalysisStore(session_factory=session_factory)
+    response = make_response("Some article text")
+    first.put(response.content_hash, "https://example.com/a", response)
+
+    result = second.get(response.content_hash, "https://example.com/a")
+    assert TextAnalysisResponse(**result) == response
+    assert second.get(response.content_hash, "https://example.com/other") is None
+    assert second.get(content_hash("Other text"), "https://example.com/a") is None
+
+def test_source_url_defaults_to_empty(session_factory):
+    response = make_response("No source")
+    AnalysisStore(session_factory=session_factory).put(response.content_hash, None, response)
+    assert AnalysisStore(session_factory=session_factory).get(response.content_hash) is not None
+
+def test_lru_evicts_least_recently_used(session_factory):
+    store = AnalysisStore(max_entries=2, session_factory=session_factory)
+    for text in ("a", "b", "c"):
+        store.put(content_hash(text), "", {"text": text})
+    assert len(store) == 2
+    # Evicted from the LRU but still in the database
+    assert store.get(content_hash("a")) == {"text": "a"}
+
+def test_database_errors_fall_back_to_memory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'store.db'}")
+    store = AnalysisStore(session_factory=sessionmaker(bind=engine))
+    store.put(content_hash("text"), "", {"score": 1})
+    assert store.get(content_hash("text")) == {"score": 1}
+    assert store.get(content_hash("unknown")) is None
+
+def test_repeat_put_does_not_write_again(session_factory):
+    first, second = AnalysisStore(session_factory=session_factory), AnalysisStore(session_factory=session_factory)
+    text_hash = content_hash("Repeated text")
+    first.put(text_hash, "", {"score": 1})
+    first.put(text_hash, "", {"score": 2})
+    # A worker that has not seen the key finds it in the database
+    second.put(text_hash, "", {"score": 3})
+
+    with session_factory() as session:
+        assert session.query(Analysis).filter(Analysis.content_hash == text_hash).count() == 1
+    assert first.get(text_hash) == second.get(text_hash) == {"score": 1}
+
+def test_cached_only_reports_in_process_results(session_factory):
+    text_hash = content_hash("Cached text")
+    AnalysisStore(session_factory=session_factory).put(text_hash, "", {"score": 1})
+    store = AnalysisStore(session_factory=session_factory)
+    assert not store.cached(text_hash)
+    store.get(text_hash)
+    assert store.cached(text_hash) and not store.cached(text_hash, "https://example.com/a")
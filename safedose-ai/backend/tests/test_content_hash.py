@@ -0,0 +1,28 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from app.utils.helpers import normalize_for_hash, content_hash
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VECTORS_PATH = os.path.join(os.path.dirname(BACKEND_DIR), "shared", "content-hash-vectors.json")
+
+with open(VECTORS_PATH, encoding="utf-8") as f:
+    VECTORS = json.load(f)["vectors"]
+
+@pytest.mark.parametrize("vector", VECTORS, ids=[vector["name"] for vector in VECTORS])
+def test_vector(vector):
+    assert normalize_for_hash(vector["input"]) == vector["normalized"]
+    assert content_hash(vector["input"]) == vector["sha256"]
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js not installed")
+def test_extension_matches_vectors():
+    result = subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "scripts", "check_content_hash.py"), "--require-node"],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
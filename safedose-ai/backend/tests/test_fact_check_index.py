@@ -0,0 +1,170 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from app.services import fact_check_index
+from app.services.fact_check_index import FactCheckIndex, _append_varint, _decode_varints, load_fact_check_index
+from app.utils.helpers import tokenize
+
+@pytest.mark.parametrize("values", [
+    [0],
+    [1, 2, 127],
+    [128, 129, 16383, 16384],
+    [0, 300, 5, 2 ** 21, 2 ** 35, 7],
+])
+def test_varint_round_trip(values):
+    buf = bytearray()
+    for value in values:
+        _append_varint(buf, value)
+    assert _decode_varints(buf).tolist() == values
+    assert _decode_varints(memoryview(buf)).tolist() == values
+
+def test_varint_round_trip_random():
+    rng = random.Random(7)
+    values = [rng.choice([rng.randrange(128), rng.randrange(1 << 30)]) for _ in range(5000)]
+    buf = bytearray()
+    for value in values:
+        _append_varint(buf, value)
+    assert _decode_varints(buf).tolist() == values
+
+def test_decode_empty():
+    assert len(_decode_varints(bytearray())) == 0
+
+def brute_force_bm25(articles, query_terms, k1=1.2, b=0.75):
+    docs = [Counter(tokenize(f"{title} {text}")) for _, title, text in articles]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(docs)
+    terms = {t for q in query_terms for t in tokenize(q)}
+    scores = {}
+    for term in terms:
+        df = sum(1 for doc in docs if term in doc)
+        if df == 0:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, doc in enumerate(docs):
+            tf = doc.get(term, 0)
+            if tf:
+                norm = k1 * (1 - b + b * lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+def make_corpus(num_articles, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(400)]
+    # Zipf-like weights so some posting lists span many blocks and others are short
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    articles = []
+    for doc_id in range(num_articles):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(3, 40))
+        articles.append((f"https://example.org/{doc_id}", words[0], " ".join(words[1:])))
+    return articles, vocabulary
+
+def test_search_matches_brute_force():
+    articles, vocabulary = make_corpus(3000)
+    index = FactCheckIndex()
+    for url, title, text in articles:
+        index.add(url, title, text)
+
+    rng = random.Random(1)
+    queries = [rng.sample(vocabulary[:60], rng.randint(1, 12)) + rng.sample(vocabulary, 2) for _ in range(40)]
+    # Single-term queries, and queries where only one term is indexed (most extracted keywords
+    # are not), across terms whose posting lists span one or many blocks
+    queries += [[term] for term in vocabulary[:40:3]]
+    queries += [[term, "unindexed", "nowhere"] for term in vocabulary[1:40:3]]
+    for query in queries:
+        for k in (1, 5):
+            check_against_brute_force(index, articles, query, k)
+
+def check_against_brute_force(index, articles, query, k):
+    expected = brute_force_bm25(articles, query)
+    results = index.search(query, k=k)
+
+    top_scores = sorted(expected.values(), reverse=True)[:k]
+    assert [r['score'] for r in results] == pytest.approx(top_scores), query
+    for result in results:
+        doc_id = int(result['url'].rsplit("/", 1)[1])
+        assert expected[doc_id] == pytest.approx(result['score'])
+
+def test_search_ranks_relevant_article_first():
+    index = FactCheckIndex()
+    index.add("https://example.org/vaccines", "Vaccines do not cause autism", "Studies of vaccines and autism")
+    index.add("https://example.org/moon", "Moon landing was real", "Apollo missions")
+    index.add("https://example.org/water", "Drinking water safety", "Tap water testing")
+
+    results = index.search(["vaccines", "autism"])
+    assert results[0]['url'] == "https://example.org/vaccines"
+    assert all(r['url'] != "https://example.org/moon" for r in results)
+
+def test_search_after_add_uses_updated_statistics():
+    index = FactCheckIndex()
+    index.add("https://example.org/a", "climate report", "")
+    assert index.search(["climate"])[0]['url'] == "https://example.org/a"
+
+    index.add("https://example.org/b", "climate climate", "")
+    assert index.search(["climate"])[0]['url'] == "https://example.org/b"
+
+def test_search_without_matches():
+    index = FactCheckIndex()
+    assert index.search(["anything"]) == []
+    index.add("https://example.org/a", "vaccines", "")
+    assert index.search(["unrelated"]) == []
+    assert index.search(["vaccines"], k=0) == []
+
+def test_load_missing_corpus_returns_none(tmp_path, caplog):
+    load_fact_check_index.cache_clear()
+    try:
+        assert load_fact_check_index(str(tmp_path / "missing.jsonl")) is None
+        assert "Could not load fact-check corpus" in caplog.text
+    finally:
+        load_fact_check_index.cache_clear()
+
+def test_load_corpus(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text('{"url": "https://example.org/a", "title": "Vaccine claims", "claim": "vaccines"}\n\n')
+    load_fact_check_index.cache_clear()
+    try:
+        index = load_fact_check_index(str(path))
+        assert len(index) == 1
+        assert index.search(["vaccine"])[0]['url'] == "https://example.org/a"
+    finally:
+        load_fact_check_index.cache_clear()
+
+def test_load_corpus_skips_bad_records(tmp_path, caplog):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text(
+        '{"url": "https://example.org/a", "title": "Vaccine claims"}\n'
+        '{"url": "https://example.org/b", "title": "Truncated\n'
+        '{"title": "No url"}\n'
+        '["not", "an", "article"]\n'
+        '{"url": "https://example.org/c", "title": "Climate claims"}\n'
+    )
+    load_fact_check_index.cache_clear()
+    try:
+        index = load_fact_check_index(str(path))
+        assert len(index) == 2
+        assert index.search(["climate"])[0]['url'] == "https://example.org/c"
+        assert "Skipped 3 malformed fact-check records" in caplog.text
+    finally:
+        load_fact_check_index.cache_clear()
+
+def test_search_skips_blocks_that_cannot_reach_top_k(monkeypatch):
+    index = FactCheckIndex()
+    # A long posting list for "claim" and a handful of articles that also match "measles"
+    for doc_id in range(20 * fact_check_index.BLOCK_SIZE):
+        title = "measles vaccine claim" if doc_id % 500 == 0 else "claim"
+        index.add(f"https://example.org/{doc_id}", title, "reviewed by editors " * (doc_id % 3))
+    index.prepare()
+
+    decoded = []
+    original = index._decode_blocks
+    def counting_decode(term, info, block_ids):
+        decoded.append((term, len(block_ids)))
+        return original(term, info, block_ids)
+    monkeypatch.setattr(index, "_decode_blocks", counting_decode)
+
+    results = index.search(["measles", "claim"], k=3)
+    assert all("measles" in r['title'] for r in results)
+    claim_blocks = sum(count for term, count in decoded if term == "claim")
+    assert claim_blocks < len(index._term_blocks("claim").block_max)
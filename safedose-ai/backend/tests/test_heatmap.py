@@ -0,0 +1,83 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.services.misinformation_detector import MisinformationDetector
+from app.services.persuasion_engine import PersuasionEngine
+
+# Words that each match at most one single-word pattern, so no match spans two windows
+WORDS = [
+    "the", "report", "claims", "people", "water", "conspiracy", "secret", "guaranteed",
+    "miracle", "shocking", "government", "evidence", "data", "study", "verified", "source",
+    "fear", "amazing", "because", "expert", "viral", "limited", "official", "must", "research"
+]
+
+@pytest.fixture(scope="module")
+def detector():
+    return MisinformationDetector()
+
+@pytest.fixture(scope="module")
+def engine():
+    return PersuasionEngine()
+
+def window_texts(words, heatmap):
+    for start in heatmap.window_starts:
+        yield " ".join(words[start:start + heatmap.window_size])
+
+def test_windows_match_detect_and_analyze(detector, engine):
+    words = random.Random(3).choices(WORDS, k=437)
+    heatmap = detector.heatmap(" ".join(words), window_size=50, stride=20)
+
+    texts = list(window_texts(words, heatmap))
+    assert len(texts) == len(heatmap.misinformation_scores) == len(heatmap.persuasion_scores)
+    for text, misinformation, persuasion in zip(texts, heatmap.misinformation_scores, heatmap.persuasion_scores):
+        assert misinformation == pytest.approx(asyncio.run(detector.detect(text)).score, abs=1e-4)
+        assert persuasion == pytest.approx(asyncio.run(engine.analyze(text)).score, abs=1e-4)
+
+def test_fact_check_keywords_count_once_per_window(detector):
+    text = "secret miracle " + "data " * 20 + "shocking conspiracy"
+    heatmap = detector.heatmap(text, window_size=50)
+    assert heatmap.misinformation_scores == [pytest.approx(asyncio.run(detector.detect(text)).score, abs=1e-4)]
+
+def test_final_window_is_flush_with_end(detector):
+    heatmap = detector.heatmap(" ".join(["word"] * 437), window_size=50, stride=20)
+    assert heatmap.total_words == 437
+    assert heatmap.window_starts[:3] == [0, 20, 40]
+    assert heatmap.window_starts[-2:] == [380, 387]
+
+def test_stride_landing_on_end_adds_no_extra_window(detector):
+    heatmap = detector.heatmap(" ".join(["word"] * 100), window_size=50, stride=25)
+    assert heatmap.window_starts == [0, 25, 50]
+
+def test_short_text_is_one_window(detector):
+    text = "shocking secret miracle cure"
+    heatmap = detector.heatmap(text, window_size=50, stride=25)
+    assert heatmap.window_size == 4
+    assert heatmap.window_starts == [0]
+    assert heatmap.misinformation_scores == [pytest.approx(asyncio.run(detector.detect(text)).score, abs=1e-4)]
+
+@pytest.mark.parametrize("text", ["", "   \n\t "])
+def test_empty_text(detector, text):
+    heatmap = detector.heatmap(text)
+    assert heatmap.total_words == 0
+    assert heatmap.window_starts == heatmap.misinformation_scores == heatmap.persuasion_scores == []
+
+@pytest.mark.parametrize("window_size, stride", [(0, 25), (50, 0), (-1, -1)])
+def test_invalid_window_parameters(detector, window_size, stride):
+    with pytest.raises(ValueError):
+        detector.heatmap("some text", window_size=window_size, stride=stride)
+
+def test_conditional_pattern_stays_linear(detector, engine):
+    # Thousands of "if" with no "then" made the unbounded if.*then pattern backtrack quadratically
+    text = "if " * 20000
+    started = time.perf_counter()
+    detector.heatmap(text)
+    asyncio.run(engine.analyze(text))
+    assert time.perf_counter() - started < 5
+
+def test_conditional_pattern_stays_in_sentence(engine):
+    matched = asyncio.run(engine.analyze("If it rains then we stay in."))
+    unmatched = asyncio.run(engine.analyze("If it rains. Then we stay in."))
+    assert matched.score > unmatched.score
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from app import main
+
+@pytest.fixture(autouse=True)
+def no_configured_workers(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.delenv("API_WORKERS", raising=False)
+
+def test_configured_worker_count(monkeypatch):
+    monkeypatch.setenv("API_WORKERS", "3")
+    assert main.get_worker_count() == 3
+    monkeypatch.setenv("WEB_CONCURRENCY", "5")
+    assert main.get_worker_count() == 5
+
+def test_worker_count_follows_cpu_affinity(monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 2}, raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+    assert main.get_worker_count() == 2
+
+def test_worker_count_without_affinity(monkeypatch):
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 6)
+    assert main.get_worker_count() == 6
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import re
+import threading
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils import profiling
+from app.utils.profiling import ProfilingMiddleware, PROFILE_HEADER
+
+def http_scope(headers=()):
+    return {"type": "http", "method": "POST", "path": "/api/v1/risk-heatmap", "headers": list(headers)}
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+def test_valid_token_profiles_request():
+    middleware = ProfilingMiddleware(ok_app, admin_token="secret", sample_rate=0.0)
+    assert middleware._should_profile(http_scope([(PROFILE_HEADER.encode(), b"secret")]))
+
+def test_wrong_token_falls_through_to_sampling():
+    header = [(PROFILE_HEADER.encode(), b"wrong")]
+    assert ProfilingMiddleware(ok_app, admin_token="secret", sample_rate=1.0)._should_profile(http_scope(header))
+    assert not ProfilingMiddleware(ok_app, admin_token="secret", sample_rate=0.0)._should_profile(http_scope(header))
+
+def test_profile_records_stages_and_patterns_from_threadpool(tmp_path):
+    worker_threads = []
+
+    def score(text):
+        worker_threads.append(threading.get_ident())
+        with profiling.stage("misinformation_detector.heatmap"):
+            with profiling.pattern(r"\bsecret\b"):
+                return len(re.findall(r"\bsecret\b", text))
+
+    async def app(scope, receive, send):
+        with profiling.stage("endpoints.risk_heatmap"):
+            await run_in_threadpool(score, "secret " * 1000)
+        await ok_app(scope, receive, send)
+
+    sent = []
+    async def send(message):
+        sent.append(message)
+
+    middleware = ProfilingMiddleware(app, admin_token="secret", output_dir=str(tmp_path))
+    asyncio.run(middleware(http_scope([(PROFILE_HEADER.encode(), b"secret")]), None, send))
+
+    profile_id = dict(sent[0]["headers"])[b"x-profile-id"].decode()
+    with open(next(tmp_path.glob(f"*-{profile_id}.json"))) as f:
+        summary = json.load(f)
+    assert set(summary["stages"]) == {"request", "endpoints.risk_heatmap", "misinformation_detector.heatmap"}
+    assert summary["slowest_pattern"] == r"\bsecret\b"
+    assert list(tmp_path.glob(f"*-{profile_id}.folded"))
+    assert worker_threads and worker_threads[0] != threading.get_ident()
+
+def test_hooks_are_inert_without_profile():
+    with profiling.stage("anything"):
+        with profiling.pattern("x"):
+            pass
+    assert profiling.findall("a", "banana") == ["a", "a", "a"]
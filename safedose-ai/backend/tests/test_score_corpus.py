@@ -0,0 +1,80 @@
+import importlib.util
+import os
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("score_corpus", os.path.join(BACKEND_DIR, "scripts", "score_corpus.py"))
+score_corpus = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(score_corpus)
+
+@pytest.fixture
+def input_path(tmp_path):
+    path = tmp_path / "posts.csv"
+    path.write_text("id,text,body\n1,first post,other\n2,second post,other\n")
+    return str(path)
+
+@pytest.fixture
+def parse(monkeypatch):
+    """
+    Parse command-line arguments through main() without starting the pool.
+    """
+    def parse(*argv):
+        captured = []
+        monkeypatch.setattr(score_corpus, "run", lambda args: captured.append(args) or 0)
+        score_corpus.main(list(argv))
+        return captured[0]
+    return parse
+
+def write_one_chunk(output, run_key):
+    writer = score_corpus.ResultWriter(output, False, run_key)
+    writer.write_chunk([{'id': 1}])
+    writer.close()
+
+@pytest.mark.parametrize("changed", [
+    ("--text-column", "body"),
+    ("--id-column", "post_id"),
+    ("--url-column", "link"),
+    ("--chunk-size", "7"),
+])
+def test_resume_rejects_changed_options(tmp_path, input_path, parse, changed):
+    output = str(tmp_path / "scores.jsonl")
+    write_one_chunk(output, score_corpus.make_run_key(parse(input_path, output)))
+
+    run_key = score_corpus.make_run_key(parse(input_path, output, "--resume", *changed))
+    with pytest.raises(SystemExit, match="run settings changed"):
+        score_corpus.ResultWriter(output, True, run_key)
+
+def test_resume_rejects_modified_input(tmp_path, input_path, parse):
+    output = str(tmp_path / "scores.jsonl")
+    write_one_chunk(output, score_corpus.make_run_key(parse(input_path, output)))
+
+    with open(input_path, "a") as f:
+        f.write("3,third post,other\n")
+    with pytest.raises(SystemExit, match="input_size"):
+        score_corpus.ResultWriter(output, True, score_corpus.make_run_key(parse(input_path, output, "--resume")))
+
+def test_output_format_is_part_of_run_key(tmp_path, input_path, parse):
+    jsonl = score_corpus.make_run_key(parse(input_path, str(tmp_path / "scores.jsonl")))
+    csv = score_corpus.make_run_key(parse(input_path, str(tmp_path / "scores.csv")))
+    assert jsonl['output_format'] == 'jsonl' and csv['output_format'] == 'csv'
+
+def test_resume_with_same_options(tmp_path, input_path, parse):
+    output = str(tmp_path / "scores.jsonl")
+    write_one_chunk(output, score_corpus.make_run_key(parse(input_path, output)))
+
+    writer = score_corpus.ResultWriter(output, True, score_corpus.make_run_key(parse(input_path, output, "--resume")))
+    assert writer.chunks_done == 1 and writer.rows_done == 1
+    writer.close()
+
+def test_resume_without_progress_keeps_existing_output(tmp_path, input_path, parse):
+    output = str(tmp_path / "scores.jsonl")
+    write_one_chunk(output, score_corpus.make_run_key(parse(input_path, output)))
+    os.remove(f"{output}.progress")
+    with open(output) as f:
+        existing = f.read()
+
+    with pytest.raises(SystemExit, match="progress is unknown"):
+        score_corpus.ResultWriter(output, True, score_corpus.make_run_key(parse(input_path, output, "--resume")))
+    with open(output) as f:
+        assert f.read() == existing
@@ -1,6 +1,8 @@
 // SafeDose.ai Background Script
 // Handles extension lifecycle and communication
 
+importScripts("content-hash.js");
+
 class SafeDoseBackground {
   constructor() {
     this.apiUrl = "http://localhost:8000/api/v1";
@@ -60,23 +62,29 @@ class SafeDoseBackground {
 
   async analyzeText(text, sourceUrl) {
     try {
-      const response = await fetch(`${this.apiUrl}/analyze`, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          text: text,
-          source_url: sourceUrl,
-        }),
-      });
+      // Ask for a stored result by hash first; upload the text only on a miss
+      const hash = await contentHash(text);
+      let result = await this.lookupAnalysis(hash, sourceUrl);
+
+      if (!result) {
+        const response = await fetch(`${this.apiUrl}/analyze`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({
+            text: text,
+            source_url: sourceUrl,
+          }),
+        });
+
+        if (!response.ok) {
+          throw new Error(`API request failed: ${response.status}`);
+        }
 
-      if (!response.ok) {
-        throw new Error(`API request failed: ${response.status}`);
+        result = await response.json();
       }
 
-      const result = await response.json();
-
       // Store analysis in history
       await this.storeAnalysisHistory({
         text: text.substring(0, 200) + "...",
@@ -92,6 +100,19 @@ class SafeDoseBackground {
     }
   }
 
+  async lookupAnalysis(hash, sourceUrl) {
+    try {
+      const params = new URLSearchParams({ source_url: sourceUrl || "" });
+      const response = await fetch(`${this.apiUrl}/analyze/${hash}?${params}`);
+
+      // 404 means the server has not seen this text yet
+      return response.ok ? await response.json() : null;
+    } catch (error) {
+      console.error("Analysis lookup failed:", error);
+      return null;
+    }
+  }
+
   async getSettings() {
     return new Promise((resolve) => {
       chrome.storage.sync.get(
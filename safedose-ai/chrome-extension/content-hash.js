@@ -0,0 +1,28 @@
+// SafeDose.ai Content Hashing
+// Computes the content hash used for hash-first analysis lookups.
+// Must match normalize_for_hash/content_hash in backend/app/utils/helpers.py;
+// both are checked against shared/content-hash-vectors.json.
+
+// Explicit whitespace list (not \s, which differs between JS and Python)
+const SAFEDOSE_HASH_WHITESPACE =
+  /[\t\n\v\f\r \u0085\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]+/g;
+
+function normalizeForHash(text) {
+  return text
+    .normalize("NFC")
+    .replace(SAFEDOSE_HASH_WHITESPACE, " ")
+    .replace(/^ | $/g, "")
+    .replace(/[\ud800-\udfff]/gu, "\ufffd"); // unpaired surrogates only, as on the server
+}
+
+async function contentHash(text) {
+  const bytes = new TextEncoder().encode(normalizeForHash(text));
+  const digest = await crypto.subtle.digest("SHA-256", bytes);
+  return Array.from(new Uint8Array(digest), (byte) =>
+    byte.toString(16).padStart(2, "0")
+  ).join("");
+}
+
+if (typeof module !== "undefined") {
+  module.exports = { normalizeForHash, contentHash };
+}
@@ -3,7 +3,6 @@
 
 class SafeDoseContentAnalyzer {
     constructor() {
-        this.apiUrl = 'http://localhost:8000/api/v1';
         this.isEnabled = true;
         this.analysisResults = null;
         this.init();
@@ -35,20 +34,16 @@ class SafeDoseContentAnalyzer {
                 return; // Skip short content
             }
 
-            // Send to API for analysis
-            const response = await fetch(`${this.apiUrl}/analyze`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    text: textContent,
-                    source_url: window.location.href
-                })
+            // The background script checks for a stored result by content hash
+            // before uploading the page text
+            const response = await chrome.runtime.sendMessage({
+                action: 'analyzeText',
+                text: textContent,
+                sourceUrl: window.location.href
             });
 
-            if (response.ok) {
-                this.analysisResults = await response.json();
+            if (response && response.success) {
+                this.analysisResults = response.data;
                 this.displayResults();
             }
         } catch (error) {
@@ -152,20 +147,15 @@ class SafeDoseContentAnalyzer {
 
     async analyzeSelection(text) {
         try {
-            const response = await fetch(`${this.apiUrl}/analyze`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    text: text,
-                    source_url: window.location.href
-                })
+            // Same hash-first path as the page analysis
+            const response = await chrome.runtime.sendMessage({
+                action: 'analyzeText',
+                text: text,
+                sourceUrl: window.location.href
             });
 
-            if (response.ok) {
-                const result = await response.json();
-                this.showSelectionResults(result, text);
+            if (response && response.success) {
+                this.showSelectionResults(response.data, text);
             }
         } catch (error) {
             console.error('Selection analysis failed:', error);